@@ -1,14 +1,22 @@
+import bisect
 import datetime
 import functools
 import gettext
-import json
 import logging
+import operator
 import pathlib
 
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 __all__ = ('BankHolidays',)
 logger = logging.getLogger(__name__)
+# shared so that connections to GOV.UK are reused across instances
+_session = requests.Session()
 
 
 class BankHolidays:
@@ -21,6 +29,7 @@ class BankHolidays:
     """
 
     source_url = 'https://www.gov.uk/bank-holidays.json'
+    source_timeout = 10  # seconds
 
     # division constants
     ENGLAND_AND_WALES = 'england-and-wales'
@@ -29,10 +38,50 @@ class BankHolidays:
     ALL_DIVISIONS = (ENGLAND_AND_WALES, SCOTLAND, NORTHERN_IRELAND)
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def load_backup_data(cls):
+        """
+        Loads the cached local copy of the holiday list shipped with this package
+        NB: The file is only read once per process so the returned data is shared and must not be modified.
+        :return: dict of divisions as provided by GOV.UK
+        """
         backup_path = pathlib.Path(__file__).parent / 'bank-holidays.json'
-        with backup_path.open() as f:
-            return json.load(f)
+        return json_loads(backup_path.read_bytes())
+
+    @classmethod
+    def shared(cls, locale=None, weekend=(5, 6), use_cached_holidays=False):
+        """
+        Returns an instance shared across the whole process for the given arguments,
+        so holidays are only downloaded and processed once rather than per instance
+        NB: Shared instances are never refreshed from GOV.UK; create a new BankHolidays to load the latest holidays.
+        :param locale: the locale into which holidays should be translated; defaults to no translation
+        :param weekend: days of the week that are never work days; defaults to Saturday and Sunday
+        :param use_cached_holidays: use the cached local copy of the holiday list
+        :return: BankHolidays
+        """
+        return cls._get_shared(locale, frozenset(weekend), use_cached_holidays)
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _get_shared(cls, locale, weekend, use_cached_holidays):
+        return cls(locale=locale, weekend=weekend, use_cached_holidays=use_cached_holidays)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _get_translator(locale):
+        """
+        Returns a gettext function for the locale, loading its message catalogue only once per process
+        """
+        if locale:
+            trans = gettext.translation(
+                'messages',
+                localedir=pathlib.Path(__file__).parent / 'locale',
+                languages=[locale],
+                fallback=True,
+            )
+        else:
+            trans = gettext.NullTranslations()
+        return trans.gettext
 
     def __init__(self, locale=None, weekend=(5, 6), use_cached_holidays=False):
         """
@@ -41,28 +90,23 @@ class BankHolidays:
         :param weekend: days of the week that are never work days; defaults to Saturday and Sunday
         :param use_cached_holidays: use the cached local copy of the holiday list
         """
-        self._get_known_holiday_date_set_cache = {}
-        self.weekend = set(weekend)
+        # fixed at construction as work day lookups are precomputed from it
+        self.weekend = frozenset(weekend)
+        # indexed by date.weekday()
+        self._is_weekend = tuple(weekday in self.weekend for weekday in range(7))
         if use_cached_holidays:
             data = self.load_backup_data()
         else:
             try:
                 logger.debug(f'Downloading bank holidays from {self.source_url}')
-                data = requests.get(self.source_url).json()
+                data = json_loads(_session.get(self.source_url, timeout=self.source_timeout).content)
+                if not isinstance(data, dict) or not all(division in data for division in self.ALL_DIVISIONS):
+                    raise ValueError('Downloaded bank holiday data is missing divisions')
             except (requests.RequestException, ValueError):
                 logger.warning('Using backup bank holiday data')
                 data = self.load_backup_data()
 
-        if locale:
-            trans = gettext.translation(
-                'messages',
-                localedir=pathlib.Path(__file__).parent / 'locale',
-                languages=[locale],
-                fallback=True,
-            )
-        else:
-            trans = gettext.NullTranslations()
-        trans = trans.ugettext if hasattr(trans, 'ugettext') else trans.gettext
+        trans = self._get_translator(locale)
 
         def _(text):
             if not text:
@@ -73,7 +117,7 @@ class BankHolidays:
             try:
                 return {
                     'title': _(holiday['title']),
-                    'date': datetime.datetime.strptime(holiday['date'], '%Y-%m-%d').date(),
+                    'date': datetime.date.fromisoformat(holiday['date']),
                     'notes': _(holiday.get('notes', '')),
                     'bunting': bool(holiday.get('bunting')),
                 }
@@ -83,10 +127,49 @@ class BankHolidays:
 
         self.data = {
             division: sorted(filter(None, map(map_holiday, item.get('events', []))),
-                             key=lambda e: e['date'])
+                             key=operator.itemgetter('date'))
             for division, item in data.items()
         }
 
+        self._index_holidays()
+
+    def _index_holidays(self):
+        """
+        Builds lookup structures from self.data for every division, with None for holidays common to all divisions
+        NB: This is only done when loading so later changes to self.data are not reflected in any method.
+        """
+        # parallel tuples of sorted holidays and their dates
+        # so that searches only touch dates and holidays are looked up by index when returned
+        self._sorted_holidays = {
+            division: tuple(holidays)
+            for division, holidays in self.data.items()
+        }
+        self._sorted_dates = {
+            division: tuple(holiday['date'] for holiday in holidays)
+            for division, holidays in self._sorted_holidays.items()
+        }
+        self._date_sets = {
+            division: frozenset(dates)
+            for division, dates in self._sorted_dates.items()
+        }
+
+        # intersect starting from the smallest set so fewer dates need probing
+        division_date_sets = sorted(self._date_sets.values(), key=len)
+        dates_in_common = division_date_sets[0].intersection(*division_date_sets[1:])
+        self._sorted_holidays[None] = tuple(
+            holiday
+            for holiday in self._sorted_holidays[self.ENGLAND_AND_WALES]
+            if holiday['date'] in dates_in_common
+        )
+        self._sorted_dates[None] = tuple(holiday['date'] for holiday in self._sorted_holidays[None])
+        self._date_sets[None] = dates_in_common
+
+        # sorted holidays keyed by division and year
+        self._holidays_by_year = {}
+        for division, holidays in self._sorted_holidays.items():
+            for holiday in holidays:
+                self._holidays_by_year.setdefault((division, holiday['date'].year), []).append(holiday)
+
     def __iter__(self):
         """
         Iterates over the current year's holidays that are common to *all* divisions
@@ -102,34 +185,12 @@ class BankHolidays:
         :param year: defaults to all available years
         :return: list of dicts with titles, dates, etc
         """
-        if division:
-            holidays = self.data[division]
-        else:
-            holidays = self.data[self.ENGLAND_AND_WALES]
-            dates_in_common = functools.reduce(
-                set.intersection,
-                (
-                    set(map(lambda holiday: holiday['date'], division_holidays))
-                    for division, division_holidays in self.data.items()
-                ),
-            )
-            holidays = filter(lambda holiday: holiday['date'] in dates_in_common, holidays)
+        division = division or None
+        holidays = self._sorted_holidays[division]
         if year:
-            holidays = filter(lambda holiday: holiday['date'].year == year, holidays)
+            holidays = self._holidays_by_year.get((division, year), ())
         return list(holidays)
 
-    def _get_known_holiday_date_set(self, division=None):
-        """
-        Returns an unordered set of all known bank holiday dates
-        NB: If no division is specified, only holidays common to *all* divisions are returned.
-        """
-        if division not in self._get_known_holiday_date_set_cache:
-            self._get_known_holiday_date_set_cache[division] = set(
-                holiday['date']
-                for holiday in self.get_holidays(division=division)
-            )
-        return self._get_known_holiday_date_set_cache[division]
-
     def is_holiday(self, date, division=None):
         """
         True if the date is a known bank holiday
@@ -138,7 +199,8 @@ class BankHolidays:
         :param division: see division constants; defaults to common holidays
         :return: bool
         """
-        return date in self._get_known_holiday_date_set(division=division)
+        division = division or None
+        return date in self._date_sets[division]
 
     def is_work_day(self, date, division=None):
         """
@@ -148,7 +210,8 @@ class BankHolidays:
         :param division: see division constants; defaults to common holidays
         :return: bool
         """
-        return date.weekday() not in self.weekend and date not in self._get_known_holiday_date_set(division=division)
+        division = division or None
+        return not self._is_weekend[date.weekday()] and date not in self._date_sets[division]
 
     def get_next_holiday(self, division=None, date=None):
         """
@@ -158,10 +221,12 @@ class BankHolidays:
         :param date: search starting from this date; defaults to today
         :return: dict or None
         """
+        division = division or None
         date = date or datetime.date.today()
-        for holiday in self.get_holidays(division=division):
-            if holiday['date'] > date:
-                return holiday
+        index = bisect.bisect_right(self._sorted_dates[division], date)
+        holidays = self._sorted_holidays[division]
+        if index < len(holidays):
+            return holidays[index]
 
     def get_prev_holiday(self, division=None, date=None):
         """
@@ -171,10 +236,11 @@ class BankHolidays:
         :param date: search starting from this date; defaults to today
         :return: dict or None
         """
+        division = division or None
         date = date or datetime.date.today()
-        for holiday in reversed(self.get_holidays(division=division)):
-            if holiday['date'] < date:
-                return holiday
+        index = bisect.bisect_left(self._sorted_dates[division], date)
+        if index > 0:
+            return self._sorted_holidays[division][index - 1]
 
     def get_next_work_day(self, division=None, date=None):
         """
@@ -184,12 +250,10 @@ class BankHolidays:
         :param date: search starting from this date; defaults to today
         :return: datetime.date; NB: get_next_holiday returns a dict
         """
+        division = division or None
         date = date or datetime.date.today()
         one_day = datetime.timedelta(days=1)
-        while True:
-            date += one_day
-            if self.is_work_day(date, division=division):
-                return date
+        return self._find_work_day(date + one_day, division=division, step=one_day)
 
     def get_prev_work_day(self, division=None, date=None):
         """
@@ -199,12 +263,53 @@ class BankHolidays:
         :param date: search starting from this date; defaults to today
         :return: datetime.date; NB: get_next_holiday returns a dict
         """
+        division = division or None
         date = date or datetime.date.today()
         one_day = datetime.timedelta(days=1)
+        return self._find_work_day(date - one_day, division=division, step=-one_day)
+
+    def _find_work_day(self, date, division, step):
+        """
+        Returns the given date if it is a work day, otherwise the nearest work day in the direction of step
+        NB: Runs of consecutive bank holidays are stepped over using the sorted dates rather than re-searching.
+        :param date: the date to start from
+        :param division: see division constants; None for common holidays
+        :param step: one day forwards or backwards as a datetime.timedelta
+        :return: datetime.date
+        """
+        dates = self._sorted_dates[division]
+        index_step = 1 if step.days > 0 else -1
         while True:
-            date -= one_day
-            if self.is_work_day(date, division=division):
+            while self._is_weekend[date.weekday()]:
+                date += step
+            index = bisect.bisect_left(dates, date)
+            if index == len(dates) or dates[index] != date:
                 return date
+            while 0 <= index < len(dates) and dates[index] == date:
+                date += step
+                index += index_step
+
+    def count_work_days_between(self, start_date, end_date, division=None):
+        """
+        Counts the work days from start_date to end_date inclusive, skipping weekends and known bank holidays
+        NB: If no division is specified, only holidays common to *all* divisions are skipped.
+        :param start_date: the first date to count
+        :param end_date: the last date to count
+        :param division: see division constants; defaults to common holidays
+        :return: int; 0 if end_date is before start_date
+        """
+        division = division or None
+        if end_date < start_date:
+            return 0
+        days = (end_date - start_date).days + 1
+        full_weeks, extra_days = divmod(days, 7)
+        weekend_days = full_weeks * sum(self._is_weekend)
+        weekend_days += sum(self._is_weekend[(start_date.weekday() + offset) % 7] for offset in range(extra_days))
+        dates = self._sorted_dates[division]
+        # GOV.UK may list several events on one date
+        holidays = set(dates[bisect.bisect_left(dates, start_date):bisect.bisect_right(dates, end_date)])
+        holidays_on_weekdays = sum(not self._is_weekend[date.weekday()] for date in holidays)
+        return days - weekend_days - holidays_on_weekdays
 
     def holidays_after(self, division=None, date=None):
         """
@@ -214,8 +319,9 @@ class BankHolidays:
         :param date: starting after this date; defaults to today
         """
         date = date or datetime.date.today()
-        holidays = self.get_holidays(division=division)
-        yield from filter(lambda holiday: holiday['date'] > date, holidays)
+        division = division or None
+        index = bisect.bisect_right(self._sorted_dates[division], date)
+        yield from self._sorted_holidays[division][index:]
 
     def holidays_before(self, division=None, date=None):
         """
@@ -225,8 +331,9 @@ class BankHolidays:
         :param date: starting before this date; defaults to today
         """
         date = date or datetime.date.today()
-        holidays = reversed(self.get_holidays(division=division))
-        yield from filter(lambda holiday: holiday['date'] < date, holidays)
+        division = division or None
+        index = bisect.bisect_left(self._sorted_dates[division], date)
+        yield from reversed(self._sorted_holidays[division][:index])
 
     def work_days_after(self, division=None, date=None):
         """
@@ -235,12 +342,12 @@ class BankHolidays:
         :param division: see division constants; defaults to common holidays
         :param date: starting after this date; defaults to today
         """
+        division = division or None
         date = date or datetime.date.today()
         one_day = datetime.timedelta(days=1)
         while True:
-            date += one_day
-            if self.is_work_day(date, division=division):
-                yield date
+            date = self._find_work_day(date + one_day, division=division, step=one_day)
+            yield date
 
     def work_days_before(self, division=None, date=None):
         """
@@ -249,9 +356,9 @@ class BankHolidays:
         :param division: see division constants; defaults to common holidays
         :param date: starting before this date; defaults to today
         """
+        division = division or None
         date = date or datetime.date.today()
         one_day = datetime.timedelta(days=1)
         while True:
-            date -= one_day
-            if self.is_work_day(date, division=division):
-                yield date
+            date = self._find_work_day(date - one_day, division=division, step=-one_day)
+            yield date
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import argparse
+import concurrent.futures
 import logging
+import os
 import pathlib
 import subprocess
 import sys
@@ -26,10 +28,10 @@ def main():
     domain = 'messages'
     source_files = ['govuk_bank_holidays/i18n.py']
 
-    root_path = pathlib.Path(__file__).parent.parent
+    root_path = pathlib.Path(__file__).resolve().parent.parent
     locale_path = root_path / 'govuk_bank_holidays' / 'locale'
     if not locale_path.is_dir():
-        logging.error('This script mst be run from the repository root')
+        logging.error('Locale directory not found at %s', locale_path)
         sys.exit(1)
 
     pot_name = f'{domain}.pot'
@@ -37,11 +39,14 @@ def main():
     mo_name = f'{domain}.mo'
 
     pot_path = locale_path / pot_name
-    locales = [
-        str(path)
-        for path in locale_path.iterdir()
-        if (locale_path / path / 'LC_MESSAGES' / po_name).is_file()
-    ]
+    # tuples of locale name, PO file path and MO file path
+    locales = []
+    with os.scandir(locale_path) as entries:
+        for entry in entries:
+            po_path = os.path.join(entry.path, 'LC_MESSAGES', po_name)
+            if entry.is_dir() and os.path.isfile(po_path):
+                mo_path = os.path.join(entry.path, 'LC_MESSAGES', mo_name)
+                locales.append((entry.name, po_path, mo_path))
 
     if args.command == 'update':
         logging.info('Writing intermediate POT file')
@@ -54,7 +59,8 @@ def main():
             '--no-wrap',
             '--verbose',
         ]
-        subprocess.run(xgettext + source_files, check=True)
+        # source file paths are relative to the repository root and are recorded as such in message files
+        subprocess.run(xgettext + source_files, check=True, cwd=root_path)
 
         msgmerge = [
             'msgmerge',
@@ -63,19 +69,31 @@ def main():
             '--update',
             '--verbose',
         ]
-        for locale in locales:
+
+        def merge(locale_paths):
+            locale, po_path, _ = locale_paths
             logging.info('Writing PO file for %s locale', locale)
-            po_path = locale_path / locale / 'LC_MESSAGES' / po_name
             subprocess.run(msgmerge + [po_path, pot_path], check=True)
 
+        run_for_each_locale(merge, locales)
+
     if args.command == 'compile':
         msgfmt = ['msgfmt', '--check', '--verbose']
-        for locale in locales:
+
+        def compile_messages(locale_paths):
+            locale, po_path, mo_path = locale_paths
             logging.info('Compiling PO file for %s locale', locale)
-            po_path = locale_path / locale / 'LC_MESSAGES' / po_name
-            mo_path = locale_path / locale / 'LC_MESSAGES' / mo_name
             subprocess.run(msgfmt + ['--output-file', mo_path, po_path], check=True)
 
+        run_for_each_locale(compile_messages, locales)
+
+
+def run_for_each_locale(func, locales):
+    # locales are independent so gettext tools can run for all of them at once
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        # consuming results re-raises any failure
+        list(executor.map(func, locales))
+
 
 if __name__ == '__main__':
     main()
@@ -38,21 +38,21 @@ def update_cache():
     logging.info('Cached bank holidays event count is %d', event_count)
 
     logging.info('Downloading bank holidays from %s', BankHolidays.source_url)
-    latest_data = requests.get(BankHolidays.source_url).json()
+    response = requests.get(BankHolidays.source_url, timeout=BankHolidays.source_timeout)
+    response.raise_for_status()
+    latest_data = response.json()
     for division, latest_events in latest_data.items():
-        cached_events_dict = dict(
-            (event['date'], event)
+        events_by_date = {
+            event['date']: event
             for event in cached_data.get(division, dict(events=[]))['events']
-        )
-        latest_events_dict = dict(
+        }
+        events_by_date.update(
             (event['date'], event)
             for event in latest_events['events']
         )
-        for date, event in latest_events_dict.items():
-            cached_events_dict[date] = event
         cached_data[division] = dict(
             division=division,
-            events=list(cached_events_dict.values()),
+            events=list(events_by_date.values()),
         )
     new_event_count = sum(len(events['events']) for events in cached_data.values())
     if new_event_count == event_count:
@@ -60,9 +60,7 @@ def update_cache():
     else:
         logging.info('New cached bank holidays event count is %d', new_event_count)
 
-    with cached_path.open('w') as f:
-        json.dump(cached_data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
+    cached_path.write_text(json.dumps(cached_data, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
     return cached_data
 
 
@@ -90,12 +88,9 @@ def check_i18n(cached_data):
     from govuk_bank_holidays.i18n import translatable_messages
 
     logging.info('Checking cached bank holidays for inclusion in translation module')
-    event_messages = set()
-    events = itertools.chain.from_iterable(events['events'] for events in cached_data.values())
-    for event in events:
-        event_messages.add(event['title'])
-        if event.get('notes'):
-            event_messages.add(event['notes'])
+    events = list(itertools.chain.from_iterable(events['events'] for events in cached_data.values()))
+    event_messages = {event['title'] for event in events}
+    event_messages.update(event['notes'] for event in events if event.get('notes'))
     untranslatable_messages = event_messages - translatable_messages
     if untranslatable_messages:
         untranslatable_messages = '\n- '.join(untranslatable_messages)